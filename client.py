@@ -1,91 +1,331 @@
 import asyncio
 import logging
-from typing import List, Optional, Any
-from xml.etree import ElementTree
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import re
-import json
-import hashlib
+import random
 
 import aiohttp
+import msgspec
+import orjson
 import redis.asyncio as aioredis
-from pydantic import ValidationError, HttpUrl
+from cachetools import TTLCache
+from lxml import etree
+from xxhash import xxh3_128
 
 from schemas import Article, ArticleSummary, SpellCheckResponse
 from config import settings
 
+# Codecs for cached articles, built at import so msgspec compiles the Article type before the first request.
+_ARTICLE_DECODER = msgspec.json.Decoder(Article)
+_ARTICLE_ENCODER = msgspec.json.Encoder()
+
+# Matches a PubMed field tag such as [AU] already present in a query.
+_FIELD_TAG_RE = re.compile(r'\[[A-Za-z]{2,4}\]')
+
+# Stored in Redis in place of a result that is known not to exist. A NUL byte cannot start a JSON document.
+_NEGATIVE_CACHE_VALUE = b"\x00NULL"
+
+# Returned by _fetch when NCBI rejected the request outright (a non-retryable 4xx), as opposed to
+# failing transiently. Only such results are cached negatively.
+_REJECTED = object()
+
+# --- EFetch XML parsing ---
+# The XPath expressions are compiled once at import and reused for every article.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+_XP_PMID = etree.XPath("string(MedlineCitation/PMID)", smart_strings=False)
+_XP_TITLE = etree.XPath(".//ArticleTitle")
+_XP_AUTHORS = etree.XPath(".//AuthorList/Author")
+_XP_LAST_NAME = etree.XPath("string(LastName)", smart_strings=False)
+_XP_INITIALS = etree.XPath("string(Initials)", smart_strings=False)
+_XP_JOURNAL = etree.XPath(".//Journal/Title/text()", smart_strings=False)
+_XP_YEAR = etree.XPath(".//PubDate/Year/text()", smart_strings=False)
+_XP_VOLUME = etree.XPath(".//Journal/JournalIssue/Volume/text()", smart_strings=False)
+_XP_ISSUE = etree.XPath(".//Journal/JournalIssue/Issue/text()", smart_strings=False)
+_XP_PAGES = etree.XPath(".//Pagination/MedlinePgn/text()", smart_strings=False)
+_XP_MESH = etree.XPath(".//MeshHeadingList/MeshHeading/DescriptorName/text()", smart_strings=False)
+_XP_DOI = etree.XPath(".//ArticleIdList/ArticleId[@IdType='doi']/text()", smart_strings=False)
+_XP_ABSTRACT = etree.XPath(".//Abstract/AbstractText")
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Reads a JSON response body."""
+    return await response.json(loads=orjson.loads)
+
+def _first(values: list, default: Optional[str] = None) -> Optional[str]:
+    """Returns the first XPath result or the default if there are none."""
+    return values[0] if values else default
+
+def _fail_future(future: asyncio.Future, error: BaseException) -> None:
+    """Passes a single-flight owner's failure on to its waiters. A cancelled owner makes them fetch themselves."""
+    if future.done():
+        return
+    if isinstance(error, asyncio.CancelledError):
+        future.cancel()
+    else:
+        future.set_exception(error)
+        # Marks the exception as retrieved, so a future nobody waited for is not logged as unhandled.
+        future.exception()
+
+async def _wait_inflight(future: asyncio.Future) -> Tuple[bool, Any]:
+    """
+    Waits for a request another task has in flight and returns (True, result).
+    Returns (False, None) if that task was cancelled, so the caller can fetch the result itself.
+    """
+    try:
+        return True, await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if asyncio.current_task().cancelling() or not future.cancelled():
+            raise
+        return False, None
+
 class NCBIClient:
     """
     Client for asynchronous interaction with the NCBI E-utils API, with Redis caching.
     """
     BASE_PARAMS = {"db": "pubmed"}
+    ARTICLE_CACHE_PREFIX = "pubmed_article:"
     MAX_RETRIES = 4
     RETRY_DELAY = 2.0
+    RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
 
     def __init__(self, session: aiohttp.ClientSession, redis_client: Optional[aioredis.Redis]):
         self._session = session
         self._redis = redis_client
         self._api_key = settings.NCBI_API_KEY
+
+        base_url = settings.EUTILS_BASE_URL
+        self._url_esearch = f"{base_url}esearch.fcgi"
+        self._url_esummary = f"{base_url}esummary.fcgi"
+        self._url_efetch = f"{base_url}efetch.fcgi"
+        self._url_elink = f"{base_url}elink.fcgi"
+        self._url_espell = f"{base_url}espell.fcgi"
         
         concurrency_limit = settings.CONCURRENCY_LIMIT_WITH_KEY if self._api_key else settings.CONCURRENCY_LIMIT_WITHOUT_KEY
-        self._semaphore = asyncio.Semaphore(concurrency_limit)
+        # A counter guarded by a condition instead of a semaphore, so the limit can be resized at runtime.
+        self._concurrency_limit = concurrency_limit
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._cmax = concurrency_limit
+        # Requests currently being fetched, keyed by cache key, for single-flight deduplication.
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Small in-process cache in front of Redis for hot keys. No lock is needed: the event loop is
+        # single-threaded and there is no await between reading and writing an entry.
+        self._lru = TTLCache(maxsize=1024, ttl=min(300, settings.CACHE_TTL))
+        # Keys known to have no result are remembered for a shorter time, in process and in Redis.
+        self._negative_ttl = max(30, settings.CACHE_TTL // 60)
+        self._negative_lru = TTLCache(maxsize=1024, ttl=self._negative_ttl)
         
         logging.info(f"NCBIClient initialized. Concurrency limit: {concurrency_limit}")
         if not self._redis:
             logging.warning("Redis client not provided. Caching will be disabled.")
 
+    async def _acquire(self) -> None:
+        """Waits until a request slot is free under the current concurrency limit."""
+        async with self._cond:
+            try:
+                await self._cond.wait_for(lambda: self._active < self._cmax)
+            except asyncio.CancelledError:
+                # The wakeup may have been meant for this request; pass it on so the free slot is not lost.
+                self._cond.notify(1)
+                raise
+            self._active += 1
+
+    async def _release(self) -> None:
+        """Frees a request slot and wakes one waiting request."""
+        # The slot is freed before any await, so a cancellation while waiting for the lock cannot leak it.
+        self._active -= 1
+        await asyncio.shield(self._notify_one())
+
+    async def _notify_one(self) -> None:
+        """Wakes one request waiting for a slot."""
+        async with self._cond:
+            self._cond.notify(1)
+
+    async def set_limit(self, new_limit: int) -> None:
+        """Changes the concurrency limit at runtime. Requests already in flight are not interrupted."""
+        new_limit = max(1, new_limit)
+        async with self._cond:
+            if new_limit == self._cmax:
+                return
+            logging.info(f"Concurrency limit changed: {self._cmax} -> {new_limit}")
+            increased = new_limit > self._cmax
+            self._cmax = new_limit
+            if increased:
+                self._cond.notify_all()
+
     def _generate_cache_key(self, url: str, params: dict) -> str:
         """Generates a consistent hash key for caching."""
-        key_string = f"{url}?{json.dumps(params, sort_keys=True)}"
-        return f"pubmed_cache:{hashlib.md5(key_string.encode()).hexdigest()}"
+        hasher = xxh3_128(url.encode())
+        hasher.update(b"?")
+        hasher.update(orjson.dumps(params, option=orjson.OPT_SORT_KEYS))
+        return f"pubmed_cache:{hasher.hexdigest()}"
+
+    async def _mget_cache(self, keys: List[str]) -> List[Optional[Any]]:
+        """Reads several cache keys in a single pipelined round-trip. Misses and Redis errors yield None."""
+        if not (self._redis and keys):
+            return [None] * len(keys)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(key)
+                return await pipe.execute()
+        except aioredis.RedisError as e:
+            logging.error(f"Redis pipelined GET error: {e}. Proceeding without cache.")
+            return [None] * len(keys)
+
+    async def _mset_cache(self, items: Dict[str, Tuple[bytes, int]]) -> None:
+        """Stores several cache entries, given as (value, TTL) pairs, in a single pipelined round-trip."""
+        if not (self._redis and items):
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, (value, ttl) in items.items():
+                    pipe.set(key, value, ex=ttl)
+                await pipe.execute()
+            logging.info(f"{len(items)} entries stored in cache.")
+        except aioredis.RedisError as e:
+            logging.error(f"Redis pipelined SET error: {e}.")
 
-    async def _make_request(self, url: str, params: dict, response_type: str = 'json') -> Optional[Any]:
+    async def _make_request(self, url: str, params: dict) -> Optional[Any]:
         """
         Performs an HTTP request to the API with retries and error handling,
-        and uses Redis for caching.
+        and uses an in-process cache backed by Redis for caching.
         """
-        if self._api_key:
-            params["api_key"] = self._api_key
-
         cache_key = self._generate_cache_key(url, params)
+        result = self._lru.get(cache_key)
+        if result is not None:
+            return result
+        if cache_key in self._negative_lru:
+            return None
+
         if self._redis:
             try:
                 cached_result = await self._redis.get(cache_key)
+                if cached_result == _NEGATIVE_CACHE_VALUE:
+                    logging.info(f"Negative cache hit for key: {cache_key}")
+                    self._negative_lru[cache_key] = True
+                    return None
                 if cached_result:
                     logging.info(f"Cache hit for key: {cache_key}")
-                    return json.loads(cached_result)
+                    result = self._lru[cache_key] = orjson.loads(cached_result)
+                    return result
             except aioredis.RedisError as e:
                 logging.error(f"Redis GET error: {e}. Proceeding without cache.")
 
-        logging.info(f"Cache miss for key: {cache_key}. Fetching from source.")
-        
+        # Concurrent misses for the same key share the request that is already in flight.
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            logging.info(f"Cache miss for key: {cache_key}. Waiting for the request in flight.")
+            completed, result = await _wait_inflight(inflight)
+            if completed:
+                return result
+            return await self._make_request(url, params)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            logging.info(f"Cache miss for key: {cache_key}. Fetching from source.")
+            result = await self._fetch(url, params, _read_json)
+            rejected = result is _REJECTED
+            if rejected:
+                result = None
+            future.set_result(result)
+
+            if rejected:
+                # Requests NCBI rejected are cached briefly, so repeating them does not keep hitting NCBI.
+                # Transient failures (rate limiting, 5xx, connection errors) are never cached.
+                self._negative_lru[cache_key] = True
+                value, ttl = _NEGATIVE_CACHE_VALUE, self._negative_ttl
+            elif result is None:
+                return None
+            else:
+                value, ttl = orjson.dumps(result), settings.CACHE_TTL
+                if not self._is_cacheable(result, value):
+                    logging.info(f"Result for key {cache_key} is empty or too large. Not caching.")
+                    return result
+                self._lru[cache_key] = result
+
+            if self._redis:
+                try:
+                    await self._redis.set(cache_key, value, ex=ttl)
+                    logging.info(f"Result for key {cache_key} stored in cache.")
+                except aioredis.RedisError as e:
+                    logging.error(f"Redis SET error: {e}.")
+
+            return result
+        except BaseException as e:
+            _fail_future(future, e)
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    @staticmethod
+    def _parse_retry_after(error: aiohttp.ClientResponseError) -> Optional[float]:
+        """Returns the Retry-After delay in seconds, if the response carried one."""
+        value = error.headers.get("Retry-After") if error.headers else None
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # The HTTP-date form is not used by NCBI; fall back to the computed backoff.
+            return None
+
+    @staticmethod
+    def _is_cacheable(result: Any, payload: bytes) -> bool:
+        """Cache admission: skips oversized payloads and ESearch results without any PMIDs."""
+        if len(payload) > settings.CACHE_MAX_BYTES:
+            return False
+        if isinstance(result, dict) and "esearchresult" in result:
+            return bool(result["esearchresult"].get("idlist"))
+        return True
+
+    async def _fetch(self, url: str, params: dict, reader: Callable[[aiohttp.ClientResponse], Awaitable[Any]], method: str = 'GET') -> Optional[Any]:
+        """
+        Performs an HTTP request to the API with retries and error handling, bypassing the cache.
+        The response body is consumed by `reader`. POST requests send the parameters as form data.
+        Returns None if the request failed, or _REJECTED if NCBI rejected it with a non-retryable 4xx.
+        """
+        # The API key is added here rather than by callers, so it never becomes part of a cache key.
+        if self._api_key:
+            params = {**params, "api_key": self._api_key}
+
         last_exception = None
         for attempt in range(self.MAX_RETRIES):
             try:
-                async with self._semaphore:
-                    timeout = aiohttp.ClientTimeout(total=30)
-                    async with self._session.get(url, params=params, timeout=timeout) as response:
+                await self._acquire()
+                try:
+                    request_kwargs = {"data": params} if method == 'POST' else {"params": params}
+                    async with self._session.request(method, url, **request_kwargs) as response:
                         response.raise_for_status()
-                        
-                        result = await response.json() if response_type == 'json' else await response.text()
-                        
-                        if self._redis:
-                            try:
-                                await self._redis.set(cache_key, json.dumps(result), ex=settings.CACHE_TTL)
-                                logging.info(f"Result for key {cache_key} stored in cache.")
-                            except aioredis.RedisError as e:
-                                logging.error(f"Redis SET error: {e}.")
-                        
-                        return result
+                        result = await reader(response)
+                finally:
+                    await self._release()
+
+                # Recover one slot per successful request after backing off on rate limiting.
+                if self._cmax < self._concurrency_limit:
+                    await self.set_limit(self._cmax + 1)
+                return result
             except aiohttp.ClientError as e:
                 last_exception = e
-                if isinstance(e, aiohttp.ClientResponseError) and (e.status == 429 or e.status >= 500):
-                    delay = self.RETRY_DELAY ** attempt
+                status = e.status if isinstance(e, aiohttp.ClientResponseError) else None
+                if status == 429:
+                    await self.set_limit(self._cmax // 2)
+                if status in self.RETRYABLE_STATUSES:
+                    # Exponential backoff with jitter, so that concurrent retries do not fire together.
+                    delay = self.RETRY_DELAY * (2 ** attempt) + random.uniform(0, 0.5)
+                    if status == 429:
+                        retry_after = self._parse_retry_after(e)
+                        if retry_after is not None:
+                            delay = max(retry_after, delay)
                     logging.warning(f"Attempt {attempt + 1}/{self.MAX_RETRIES} failed ({e}). Retrying in {delay:.1f} sec.")
                     if attempt < self.MAX_RETRIES - 1:
                         await asyncio.sleep(delay)
                     continue
                 else:
                     logging.error(f"Unrecoverable client error for URL {url}: {e}")
+                    if status is not None and 400 <= status < 500:
+                        return _REJECTED
                     break
         
         logging.error(f"Failed to execute request to {url} after {self.MAX_RETRIES} attempts. Last error: {last_exception}")
@@ -93,20 +333,21 @@ class NCBIClient:
 
     async def search_pubmed_ids(self, query: str, search_field: Optional[str], max_results: int, start_date: Optional[str], end_date: Optional[str]) -> List[str]:
         """Search for article IDs in PubMed."""
-        final_query = f"({query}){search_field}" if search_field and not re.search(r'\[[A-Za-z]{2,4}\]', query) else query
-        params = {**self.BASE_PARAMS, "term": final_query, "retmode": "json", "retmax": str(max_results), "sort": "date"}
+        final_query = f"({query}){search_field}" if search_field and not _FIELD_TAG_RE.search(query) else query
+        date_params = {"datetype": "pdat"} if (start_date or end_date) else {}
         if start_date:
-            params.update({"datetype": "pdat", "mindate": start_date})
+            date_params["mindate"] = start_date
         if end_date:
-            params.update({"datetype": "pdat", "maxdate": end_date})
+            date_params["maxdate"] = end_date
+        params = {**self.BASE_PARAMS, "term": final_query, "retmode": "json", "retmax": str(max_results), "sort": "date", **date_params}
         
-        data = await self._make_request(f"{settings.EUTILS_BASE_URL}esearch.fcgi", params)
+        data = await self._make_request(self._url_esearch, params)
         return data.get("esearchresult", {}).get("idlist", []) if data else []
 
     async def check_spelling(self, query: str) -> SpellCheckResponse:
         """Check spelling of a query."""
         params = {**self.BASE_PARAMS, "term": query, "retmode": "json"}
-        data = await self._make_request(f"{settings.EUTILS_BASE_URL}espell.fcgi", params)
+        data = await self._make_request(self._url_espell, params)
         if not data: return SpellCheckResponse(original_query=query, corrected_query=None, has_correction=False)
         corrected = data.get("es-result", {}).get("corrected")
         return SpellCheckResponse(original_query=query, corrected_query=corrected, has_correction=bool(corrected and corrected.lower() != query.lower()))
@@ -116,7 +357,7 @@ class NCBIClient:
         if not pmids:
             return []
         params = {**self.BASE_PARAMS, "id": ",".join(pmids), "retmode": "json"}
-        data = await self._make_request(f"{settings.EUTILS_BASE_URL}esummary.fcgi", params)
+        data = await self._make_request(self._url_esummary, params)
         if not (data and "result" in data):
             return []
         
@@ -125,23 +366,19 @@ class NCBIClient:
         for pmid in result.get("uids", []):
             if pmid in result:
                 info = result[pmid]
-                try:
-                    summary = ArticleSummary(
-                        pmid=info.get("uid", ""),
-                        title=info.get("title", "No Title"),
-                        pub_date=info.get("pubdate", ""),
-                        journal=info.get("source", ""),
-                        authors=[a.get("name", "") for a in info.get("authors", [])]
-                    )
-                    summaries.append(summary)
-                except ValidationError as e:
-                    logging.warning(f"Validation error for PMID {pmid} in get_summaries: {e}")
+                summaries.append(ArticleSummary(
+                    pmid=info.get("uid", ""),
+                    title=info.get("title", "No Title"),
+                    pub_date=info.get("pubdate", ""),
+                    journal=info.get("source", ""),
+                    authors=[a.get("name", "") for a in info.get("authors", [])]
+                ))
         return summaries
 
     async def find_related_ids(self, source_pmid: str, max_results: int) -> List[str]:
         """Find related articles via ELink."""
         params = {**self.BASE_PARAMS, "id": source_pmid, "linkname": "pubmed_pubmed", "cmd": "neighbor_history"}
-        data = await self._make_request(f"{settings.EUTILS_BASE_URL}elink.fcgi", params)
+        data = await self._make_request(self._url_elink, params)
         if not (data and data.get("linksets")):
             return []
         
@@ -150,66 +387,188 @@ class NCBIClient:
         query_key = linkset["linksetdbs"][0].get("querykey")
         
         fetch_params = {**self.BASE_PARAMS, "query_key": query_key, "WebEnv": webenv, "retmode": "json", "retmax": str(max_results)}
-        fetch_data = await self._make_request(f"{settings.EUTILS_BASE_URL}esearch.fcgi", fetch_params)
+        fetch_data = await self._make_request(self._url_esearch, fetch_params)
         return fetch_data.get("esearchresult", {}).get("idlist", []) if fetch_data else []
 
-    async def fetch_article_details(self, pmid: str) -> Optional[Article]:
-        """Fetch full details for an article by its PMID."""
-        params = {**self.BASE_PARAMS, "id": pmid, "retmode": "xml", "rettype": "abstract"}
-        url = f"{settings.EUTILS_BASE_URL}efetch.fcgi"
+    @staticmethod
+    def _parse_article_node(article_node: etree._Element, pmid: str) -> Article:
+        """Build an Article from a single <PubmedArticle> node."""
+        title_nodes = _XP_TITLE(article_node)
+        title = "".join(title_nodes[0].itertext()).strip() if title_nodes else "No Title Found"
+
+        authors = [f"{_XP_LAST_NAME(a)} {_XP_INITIALS(a)}".strip() for a in _XP_AUTHORS(article_node)]
+        journal = _first(_XP_JOURNAL(article_node), "N/A")
+        pub_date = _first(_XP_YEAR(article_node), "N/A")
+        volume = _first(_XP_VOLUME(article_node))
+        issue = _first(_XP_ISSUE(article_node))
+        pages = _first(_XP_PAGES(article_node))
+
+        mesh_terms = _XP_MESH(article_node)
+        doi = _first(_XP_DOI(article_node))
+
+        abstract_parts = []
+        for node in _XP_ABSTRACT(article_node):
+            full_text = "".join(node.itertext()).strip()
+            if not full_text:
+                continue
+
+            label = node.get('Label')
+            if label:
+                part = f"**{label.strip()}:** {full_text}"
+            else:
+                part = full_text
+            abstract_parts.append(part)
+        abstract = "\n\n".join(abstract_parts) or "Abstract not available."
+
+        return Article(
+            pmid=pmid,
+            title=title,
+            abstract=abstract,
+            authors=authors,
+            journal=journal,
+            pub_date=pub_date,
+            mesh_terms=mesh_terms,
+            doi=doi,
+            link=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+            volume=volume,
+            issue=issue,
+            pages=pages
+        )
+
+    def _collect_articles(self, parser: etree.XMLPullParser, articles: Dict[str, Article]) -> None:
+        """Builds Articles from the <PubmedArticle> elements completed so far and frees their subtrees."""
+        for _, article_node in parser.read_events():
+            pmid = _XP_PMID(article_node)
+            if pmid:
+                articles[pmid] = self._parse_article_node(article_node, pmid)
+            article_node.clear()
+            while article_node.getprevious() is not None:
+                del article_node.getparent()[0]
+
+    async def _read_articles(self, response: aiohttp.ClientResponse) -> Dict[str, Article]:
+        """Parses an EFetch XML response as it arrives instead of buffering the whole body."""
+        parser = etree.XMLPullParser(events=("end",), tag="PubmedArticle", huge_tree=True, recover=True)
+        articles = {}
+        async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+            self._collect_articles(parser, articles)
+        parser.close()
+        self._collect_articles(parser, articles)
+        return articles
+
+    async def _efetch_articles(self, pmids: List[str]) -> Optional[Dict[str, Article]]:
+        """
+        Fetch and parse several articles with a single batched EFetch request, bypassing the cache.
+        Returns None if the request failed, so that callers can tell a failure from missing articles.
+        """
+        # POST is used because a long id list can exceed URL length limits.
+        params = {**self.BASE_PARAMS, "id": ",".join(pmids), "retmode": "xml", "rettype": "abstract"}
         try:
-            xml_data = await self._make_request(url, params, 'text')
-            if not xml_data:
-                return None
-            
-            root = ElementTree.fromstring(xml_data)
-            article_node = root.find(".//PubmedArticle")
-            if article_node is None:
-                return None
+            articles = await self._fetch(self._url_efetch, params, self._read_articles, method='POST')
+        except etree.XMLSyntaxError as e:
+            logging.error(f"Error parsing EFetch response for PMIDs {params['id']}: {e}")
+            return None
+        return articles if isinstance(articles, dict) else None
 
-            title_node = article_node.find(".//ArticleTitle")
-            title = "".join(title_node.itertext()).strip() if title_node is not None else "No Title Found"
-            
-            authors = [f"{a.findtext('LastName', '')} {a.findtext('Initials', '')}".strip() for a in article_node.findall(".//AuthorList/Author")]
-            journal = article_node.findtext(".//Journal/Title", "N/A")
-            pub_date = article_node.findtext(".//PubDate/Year", "N/A")
-            volume = article_node.findtext(".//Journal/JournalIssue/Volume")
-            issue = article_node.findtext(".//Journal/JournalIssue/Issue")
-            pages = article_node.findtext(".//Pagination/MedlinePgn")
-            
-            mesh_terms = [term.text for term in article_node.findall(".//MeshHeadingList/MeshHeading/DescriptorName") if term.text]
-            
-            doi_node = article_node.find(f".//ArticleIdList/ArticleId[@IdType='doi']")
-            doi = doi_node.text if doi_node is not None else None
-            
-            abstract_parts = []
-            for node in article_node.findall(".//Abstract/AbstractText"):
-                full_text = "".join(node.itertext()).strip()
-                if not full_text:
+    async def _fetch_missing_articles(self, pmids: List[str]) -> Dict[str, Article]:
+        """
+        Fetch articles missing from the cache. PMIDs already being fetched by another request are
+        waited for instead of fetched again; the rest are fetched with one EFetch request and cached.
+        PMIDs that EFetch did not return are cached negatively for a short time.
+        """
+        loop = asyncio.get_running_loop()
+        inflight = {}
+        owned = {}
+        for pmid in pmids:
+            cache_key = f"{self.ARTICLE_CACHE_PREFIX}{pmid}"
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                inflight[pmid] = future
+            else:
+                owned[pmid] = self._inflight[cache_key] = loop.create_future()
+
+        articles = {}
+        if owned:
+            try:
+                fetched = await self._efetch_articles(list(owned))
+                for pmid, future in owned.items():
+                    future.set_result(fetched.get(pmid) if fetched else None)
+
+                if fetched is not None:
+                    articles.update(fetched)
+                    for pmid, article in fetched.items():
+                        self._lru[f"{self.ARTICLE_CACHE_PREFIX}{pmid}"] = article
+                    to_cache = {f"{self.ARTICLE_CACHE_PREFIX}{pmid}": (_ARTICLE_ENCODER.encode(article), settings.CACHE_TTL) for pmid, article in fetched.items()}
+
+                    not_found = [f"{self.ARTICLE_CACHE_PREFIX}{pmid}" for pmid in owned if pmid not in fetched]
+                    if not_found:
+                        logging.info(f"{len(not_found)} PMIDs not returned by EFetch. Caching them negatively.")
+                        for cache_key in not_found:
+                            self._negative_lru[cache_key] = True
+                            to_cache[cache_key] = (_NEGATIVE_CACHE_VALUE, self._negative_ttl)
+                    await self._mset_cache(to_cache)
+            except BaseException as e:
+                for future in owned.values():
+                    _fail_future(future, e)
+                raise
+            finally:
+                for pmid in owned:
+                    self._inflight.pop(f"{self.ARTICLE_CACHE_PREFIX}{pmid}", None)
+
+        retry = []
+        for pmid, future in inflight.items():
+            completed, article = await _wait_inflight(future)
+            if not completed:
+                retry.append(pmid)
+            elif article is not None:
+                articles[pmid] = article
+        if retry:
+            articles.update({article.pmid: article for article in await self.fetch_articles_details(retry)})
+        return articles
+
+    async def fetch_articles_details(self, pmids: List[str]) -> List[Article]:
+        """
+        Fetch full details for several articles. Cached articles are read with one pipelined
+        Redis round-trip and the rest are fetched with a single batched EFetch request.
+        Articles are returned in the order of the given PMIDs; missing ones are skipped.
+        """
+        if not pmids:
+            return []
+        # EFetch returns articles under their canonical PMID (no leading zeros), so ids are
+        # normalized before they are used as cache keys or matched against the response.
+        pmids = [pmid.lstrip("0") or "0" for pmid in pmids]
+        articles = {}
+        uncached = []
+        for pmid in dict.fromkeys(pmids):
+            cache_key = f"{self.ARTICLE_CACHE_PREFIX}{pmid}"
+            article = self._lru.get(cache_key)
+            if article is not None:
+                articles[pmid] = article
+            elif cache_key not in self._negative_lru:
+                uncached.append(pmid)
+
+        cached_results = await self._mget_cache([f"{self.ARTICLE_CACHE_PREFIX}{pmid}" for pmid in uncached])
+        missing = []
+        for pmid, cached_result in zip(uncached, cached_results):
+            if cached_result == _NEGATIVE_CACHE_VALUE:
+                self._negative_lru[f"{self.ARTICLE_CACHE_PREFIX}{pmid}"] = True
+                continue
+            if cached_result:
+                try:
+                    article = _ARTICLE_DECODER.decode(cached_result)
+                    articles[pmid] = self._lru[f"{self.ARTICLE_CACHE_PREFIX}{pmid}"] = article
                     continue
-                
-                label = node.get('Label')
-                if label:
-                    part = f"**{label.strip()}:** {full_text}"
-                else:
-                    part = full_text
-                abstract_parts.append(part)
-            abstract = "\n\n".join(abstract_parts) or "Abstract not available."
-
-            return Article(
-                pmid=pmid,
-                title=title.strip(),
-                abstract=abstract,
-                authors=authors,
-                journal=journal,
-                pub_date=pub_date,
-                mesh_terms=mesh_terms,
-                doi=doi,
-                link=HttpUrl(f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"),
-                volume=volume,
-                issue=issue,
-                pages=pages
-            )
-        except (ElementTree.ParseError, ValidationError) as e:
-            logging.error(f"Error processing data for PMID {pmid}: {e}")
-            return None
+                except msgspec.DecodeError as e:
+                    logging.warning(f"Discarding unreadable cached article {pmid}: {e}")
+            missing.append(pmid)
+
+        logging.info(f"Article cache: {len(articles)} hits, {len(missing)} misses.")
+        if missing:
+            articles.update(await self._fetch_missing_articles(missing))
+
+        return [articles[pmid] for pmid in pmids if pmid in articles]
+
+    async def fetch_article_details(self, pmid: str) -> Optional[Article]:
+        """Fetch full details for an article by its PMID."""
+        articles = await self.fetch_articles_details([pmid])
+        return articles[0] if articles else None
@@ -17,6 +17,7 @@ class AppSettings(BaseSettings):
     
     # Cache Settings
     CACHE_TTL: int = 3600 # in seconds (1 hour)
+    CACHE_MAX_BYTES: int = 1_000_000 # larger responses are not cached
 
     # Redis Settings
     REDIS_HOST: str = "redis"
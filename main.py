@@ -1,17 +1,20 @@
 import asyncio
 import logging
-from typing import List, Optional
+from typing import Any, List, Optional
 from contextlib import asynccontextmanager
 
 import aiohttp
+import msgspec
 import uvicorn
 import redis.asyncio as aioredis
 from fastapi import FastAPI, Query, Depends, Path, HTTPException, Security
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import Response
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
-from schemas import Article, ArticleSummary, SpellCheckResponse, SemanticSearchResult, CitationResponse
+from schemas import Article, ArticleSummary, SpellCheckResponse, SemanticSearchResult, CitationResponse, ama_citation
 from client import NCBIClient
 
 # --- Logging Configuration ---
@@ -25,48 +28,104 @@ app_state = {}
 async def lifespan(app: FastAPI):
     """
     Context manager to handle FastAPI's lifespan events.
-    Creates and closes session/connection pools on startup and shutdown.
+    Creates and closes session/connection pools and the shared NCBI client on startup and shutdown.
     """
-    # Create aiohttp session
+    # Create aiohttp session. All traffic goes to a single NCBI host, so the connector keeps
+    # enough idle keep-alive connections around to reuse them instead of reconnecting.
     logging.info("Application startup: creating aiohttp session.")
-    app_state["http_session"] = aiohttp.ClientSession()
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=settings.CONCURRENCY_LIMIT_WITH_KEY * 2,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+        ttl_dns_cache=300
+    )
+    app_state["http_session"] = aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": f"{settings.APP_TITLE}/{settings.APP_VERSION}"},
+        timeout=aiohttp.ClientTimeout(total=30, sock_connect=5)
+    )
     
     # Create Redis connection pool
     logging.info(f"Application startup: creating Redis connection pool at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
     try:
         redis_pool = aioredis.ConnectionPool.from_url(
             f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0",
-            max_connections=10,
-            decode_responses=True
+            max_connections=10
         )
         app_state["redis_pool"] = redis_pool
+        # A single client is shared by all requests; it multiplexes commands over the pool.
+        app_state["redis_client"] = aioredis.Redis(connection_pool=redis_pool)
         # Check connection
-        async with aioredis.Redis(connection_pool=redis_pool) as r:
-            await r.ping()
+        await app_state["redis_client"].ping()
         logging.info("Successfully connected to Redis.")
     except Exception as e:
         logging.error(f"Could not connect to Redis: {e}. Caching will be disabled.")
+        if app_state.get("redis_client"):
+            await app_state["redis_client"].aclose()
+        if app_state.get("redis_pool"):
+            await app_state["redis_pool"].disconnect()
+        app_state["redis_client"] = None
         app_state["redis_pool"] = None
 
+    # A single NCBI client is shared by all requests so that its concurrency limit applies process-wide.
+    app_state["ncbi_client"] = NCBIClient(session=get_http_session(), redis_client=get_redis())
+
     yield
     
     # Close connections
     logging.info("Application shutdown: closing aiohttp session.")
     await app_state["http_session"].close()
     
+    redis_client = app_state.get("redis_client")
+    if redis_client:
+        await redis_client.aclose()
+
     redis_pool = app_state.get("redis_pool")
     if redis_pool:
         logging.info("Application shutdown: closing Redis connection pool.")
         await redis_pool.disconnect()
 
+# --- Response Serialization ---
+# Response models are msgspec Structs, which FastAPI cannot validate or encode itself.
+# Endpoints return MsgspecJSONResponse directly, and the OpenAPI schemas are generated by msgspec.
+_ENCODER = msgspec.json.Encoder()
+_SCHEMA_REF_TEMPLATE = "#/components/schemas/{name}"
+_RESPONSE_TYPES = (List[Article], List[ArticleSummary], List[CitationResponse], List[SemanticSearchResult], SpellCheckResponse)
+
+class MsgspecJSONResponse(Response):
+    """JSON response rendered with msgspec."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _ENCODER.encode(content)
+
+def response_schema(response_type: Any) -> dict:
+    """Builds the OpenAPI description of a successful response of the given type."""
+    (schema,), _ = msgspec.json.schema_components([response_type], ref_template=_SCHEMA_REF_TEMPLATE)
+    return {200: {"description": "Successful Response", "content": {"application/json": {"schema": schema}}}}
+
 # --- FastAPI App Creation ---
 app = FastAPI(
     title=settings.APP_TITLE,
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=MsgspecJSONResponse
 )
 
+def custom_openapi() -> dict:
+    """Generates the OpenAPI schema, adding the msgspec response models to its components."""
+    if app.openapi_schema:
+        return app.openapi_schema
+    openapi_schema = get_openapi(title=app.title, version=app.version, description=app.description, routes=app.routes)
+    _, components = msgspec.json.schema_components(_RESPONSE_TYPES, ref_template=_SCHEMA_REF_TEMPLATE)
+    openapi_schema.setdefault("components", {}).setdefault("schemas", {}).update(components)
+    app.openapi_schema = openapi_schema
+    return app.openapi_schema
+
+app.openapi = custom_openapi
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -83,17 +142,12 @@ def get_http_session() -> aiohttp.ClientSession:
     return app_state["http_session"]
 
 def get_redis() -> Optional[aioredis.Redis]:
-    """Dependency to get an async Redis client from the connection pool."""
-    if app_state.get("redis_pool"):
-        return aioredis.Redis(connection_pool=app_state["redis_pool"])
-    return None
-
-def get_ncbi_client(
-    session: aiohttp.ClientSession = Depends(get_http_session),
-    redis_client: Optional[aioredis.Redis] = Depends(get_redis)
-) -> NCBIClient:
-    """Dependency to get the NCBI client, injecting the Redis client."""
-    return NCBIClient(session=session, redis_client=redis_client)
+    """Dependency to get the shared async Redis client from the application state."""
+    return app_state.get("redis_client")
+
+def get_ncbi_client() -> NCBIClient:
+    """Dependency to get the shared NCBI client from the application state."""
+    return app_state["ncbi_client"]
 
 async def get_api_key(api_key: str = Security(api_key_header)):
     """Checks the API key provided in the X-API-Key header."""
@@ -106,7 +160,7 @@ async def get_api_key(api_key: str = Security(api_key_header)):
         )
 
 # --- API Endpoints ---
-@app.get("/search", response_model=List[Article], summary="Search for articles (full data)", tags=["Search"], dependencies=[Depends(get_api_key)])
+@app.get("/search", responses=response_schema(List[Article]), summary="Search for articles (full data)", tags=["Search"], dependencies=[Depends(get_api_key)])
 async def search_articles(
     query: str = Query(..., description="Search query"),
     client: NCBIClient = Depends(get_ncbi_client),
@@ -121,13 +175,11 @@ async def search_articles(
     """
     pmids = await client.search_pubmed_ids(query, search_field, max_results, start_date, end_date)
     if not pmids:
-        return []
+        return MsgspecJSONResponse([])
     
-    tasks = [client.fetch_article_details(pmid) for pmid in pmids]
-    results = await asyncio.gather(*tasks)
-    return [res for res in results if res]
+    return MsgspecJSONResponse(await client.fetch_articles_details(pmids))
 
-@app.get("/search/summary", response_model=List[ArticleSummary], summary="Quick search (summary)", tags=["Search"], dependencies=[Depends(get_api_key)])
+@app.get("/search/summary", responses=response_schema(List[ArticleSummary]), summary="Quick search (summary)", tags=["Search"], dependencies=[Depends(get_api_key)])
 async def search_summaries(
     query: str = Query(..., description="Search query"),
     client: NCBIClient = Depends(get_ncbi_client),
@@ -141,9 +193,9 @@ async def search_summaries(
     PMID, title, date, journal, and authors.
     """
     pmids = await client.search_pubmed_ids(query, search_field, max_results, start_date, end_date)
-    return await client.get_summaries(pmids)
+    return MsgspecJSONResponse(await client.get_summaries(pmids))
 
-@app.get("/search/guidelines", response_model=List[Article], summary="Search for guidelines with full text", tags=["Search"], dependencies=[Depends(get_api_key)])
+@app.get("/search/guidelines", responses=response_schema(List[Article]), summary="Search for guidelines with full text", tags=["Search"], dependencies=[Depends(get_api_key)])
 async def search_guidelines(
     query: str = Query(..., description="Topic to search for guidelines"),
     client: NCBIClient = Depends(get_ncbi_client),
@@ -158,13 +210,11 @@ async def search_guidelines(
     
     pmids = await client.search_pubmed_ids(guideline_query, search_field=None, max_results=max_results, start_date=None, end_date=None)
     if not pmids:
-        return []
+        return MsgspecJSONResponse([])
     
-    tasks = [client.fetch_article_details(pmid) for pmid in pmids]
-    results = await asyncio.gather(*tasks)
-    return [res for res in results if res]
+    return MsgspecJSONResponse(await client.fetch_articles_details(pmids))
 
-@app.get("/search/citations", response_model=List[CitationResponse], summary="Search and get citations (AMA format)", tags=["Search"], dependencies=[Depends(get_api_key)])
+@app.get("/search/citations", responses=response_schema(List[CitationResponse]), summary="Search and get citations (AMA format)", tags=["Search"], dependencies=[Depends(get_api_key)])
 async def search_and_get_citations(
     query: str = Query(..., description="Search query"),
     client: NCBIClient = Depends(get_ncbi_client),
@@ -178,18 +228,17 @@ async def search_and_get_citations(
     """
     pmids = await client.search_pubmed_ids(query, search_field, max_results, start_date, end_date)
     if not pmids:
-        return []
+        return MsgspecJSONResponse([])
     
-    tasks = [client.fetch_article_details(pmid) for pmid in pmids]
-    articles = await asyncio.gather(*tasks)
+    articles = await client.fetch_articles_details(pmids)
     
     response = [
-        CitationResponse(citation=article.to_ama_citation(), link=article.link)
-        for article in articles if article
+        CitationResponse(citation=ama_citation(article), link=article.link)
+        for article in articles
     ]
-    return response
+    return MsgspecJSONResponse(response)
 
-@app.get("/semantic_search/{pmid}", response_model=List[SemanticSearchResult], summary="Search for semantically similar articles (Demo)", tags=["Discovery"], dependencies=[Depends(get_api_key)])
+@app.get("/semantic_search/{pmid}", responses=response_schema(List[SemanticSearchResult]), summary="Search for semantically similar articles (Demo)", tags=["Discovery"], dependencies=[Depends(get_api_key)])
 async def semantic_search(
     pmid: str = Path(..., regex=r"^\d+$", description="PMID of the source article for similarity search"),
     client: NCBIClient = Depends(get_ncbi_client),
@@ -200,22 +249,23 @@ async def semantic_search(
     In a real application, this endpoint would use vector embeddings.
     Here, ELink logic is used for demonstration purposes.
     """
-    # Step 1: Check if the source article exists
-    source_article = await client.fetch_article_details(pmid)
+    # Steps 1 and 2 are independent, so they run concurrently:
+    # check that the source article exists and simulate a vector DB search using ELink.
+    logging.info("Demo mode: using ELink to simulate semantic search...")
+    source_article, similar_pmids = await asyncio.gather(
+        client.fetch_article_details(pmid),
+        client.find_related_ids(pmid, max_results)
+    )
     if not source_article:
         raise HTTPException(status_code=404, detail=f"Source article with PMID {pmid} not found.")
 
-    # Step 2: Simulate a vector DB search using ELink
-    logging.info("Demo mode: using ELink to simulate semantic search...")
-    similar_pmids = await client.find_related_ids(pmid, max_results)
     if not similar_pmids:
-        return []
+        return MsgspecJSONResponse([])
     
-    similar_pmids = [rel_pmid for rel_pmid in similar_pmids if rel_pmid != pmid][:max_results]
+    similar_pmids = [rel_pmid for rel_pmid in similar_pmids if rel_pmid != source_article.pmid][:max_results]
 
     # Step 3: Get full details for the found articles
-    tasks = [client.fetch_article_details(rel_pmid) for rel_pmid in similar_pmids]
-    articles = [res for res in await asyncio.gather(*tasks) if res is not None]
+    articles = await client.fetch_articles_details(similar_pmids)
 
     # Step 4: Formulate the response with a simulated similarity score
     response = []
@@ -224,9 +274,9 @@ async def semantic_search(
         score = 0.95 - (i * 0.05)
         response.append(SemanticSearchResult(score=max(0.1, score), article=article))
         
-    return response
+    return MsgspecJSONResponse(response)
 
-@app.get("/spellcheck", response_model=SpellCheckResponse, summary="Spell Check", tags=["Utilities"], dependencies=[Depends(get_api_key)])
+@app.get("/spellcheck", responses=response_schema(SpellCheckResponse), summary="Spell Check", tags=["Utilities"], dependencies=[Depends(get_api_key)])
 async def spell_check(
     query: str = Query(..., description="Short text to spell check (up to 500 characters)", max_length=500),
     client: NCBIClient = Depends(get_ncbi_client)
@@ -235,7 +285,7 @@ async def spell_check(
     Checks the spelling of a search query and suggests a correction.
     **Note:** This endpoint is intended for short search phrases, not long texts or titles.
     """
-    return await client.check_spelling(query)
+    return MsgspecJSONResponse(await client.check_spelling(query))
 
 @app.get("/", summary="Check Status", tags=["Status"])
 def read_root():
@@ -244,8 +294,9 @@ def read_root():
 
 # --- Application Entry Point ---
 # In production, this application should be run via an ASGI server like Gunicorn with Uvicorn workers.
+# Uvicorn workers pick uvloop and httptools automatically when they are installed (uvicorn[standard]).
 # Example command:
-# gunicorn -w 4 -k uvicorn.workers.UvicornWorker main:app -b 0.0.0.0:8000
+# gunicorn -w 4 -k uvicorn.workers.UvicornWorker --keep-alive 75 main:app -b 0.0.0.0:8000
 if __name__ == "__main__":
     # This part is for convenient local development, but without reload.
-    uvicorn.run("main:app", host="0.0.0.0", port=8000)
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, loop="uvloop", http="httptools", timeout_keep_alive=75, access_log=False)
@@ -1,7 +1,7 @@
 from typing import List, Optional, Annotated
-from pydantic import BaseModel, HttpUrl, Field
+import msgspec
 
-class ArticleSummary(BaseModel):
+class ArticleSummary(msgspec.Struct, frozen=True):
     """A brief summary of an article."""
     pmid: str
     title: str
@@ -9,68 +9,67 @@ class ArticleSummary(BaseModel):
     journal: str
     authors: List[str]
 
-class Article(ArticleSummary):
+class Article(ArticleSummary, frozen=True, kw_only=True):
     """Complete information about an article."""
     abstract: str
-    mesh_terms: List[str] = Field(default_factory=list)
+    mesh_terms: List[str] = msgspec.field(default_factory=list)
     doi: Optional[str] = None
-    link: HttpUrl
+    link: str
     volume: Optional[str] = None
     issue: Optional[str] = None
     pages: Optional[str] = None
 
-    def to_ama_citation(self) -> str:
-        """Formats the article data into an AMA citation string."""
-        
-        # Author formatting
+def ama_citation(article: Article) -> str:
+    """Formats the article data into an AMA citation string."""
+
+    # Author formatting
+    # AMA style: list all authors if 6 or fewer; if more than 6, list the first 3, followed by et al.
+    authors = article.authors
+    if not authors:
         authors_str = ""
-        if self.authors:
-            # AMA style: list all authors if 6 or fewer; if more than 6, list the first 3, followed by et al.
-            if len(self.authors) > 6:
-                authors_str = ", ".join(self.authors[:3]) + ", et al"
-            else:
-                authors_str = ", ".join(self.authors)
-        
-        # Title - remove any lingering markdown and end with a period.
-        title = self.title.replace('*', '').strip()
-        if not title.endswith('.'):
-            title += '.'
+    elif len(authors) > 6:
+        authors_str = f"{authors[0]}, {authors[1]}, {authors[2]}, et al"
+    else:
+        authors_str = ", ".join(authors)
+
+    # Title - remove any lingering markdown and end with a period.
+    title = article.title
+    if '*' in title:
+        title = title.replace('*', '')
+    title = title.strip()
+    if not title.endswith('.'):
+        title += '.'
 
-        # Journal name - AMA style often uses standard abbreviations, but full name is acceptable.
-        # Italicized and followed by a period.
-        journal = f"*{self.journal.strip()}*." if self.journal else ""
+    # Journal name - AMA style often uses standard abbreviations, but full name is acceptable.
+    # Italicized and followed by a period.
+    journal = f"*{article.journal.strip()}*." if article.journal else ""
 
-        # Year, followed by a semicolon.
-        year = f"{self.pub_date};" if self.pub_date else ""
+    # Year, followed by a semicolon.
+    year = f"{article.pub_date};" if article.pub_date else ""
 
-        # Citation details: Volume(Issue):Pages.
+    # Citation details: Volume(Issue):Pages.
+    volume, issue, pages = article.volume, article.issue, article.pages
+    if volume or issue or pages:
+        cit_details = "".join((volume or "", f"({issue})" if issue else "", f":{pages}" if pages else "", "."))
+    else:
         cit_details = ""
-        if self.volume:
-            cit_details += self.volume
-        if self.issue:
-            cit_details += f"({self.issue})"
-        if self.pages:
-            cit_details += f":{self.pages}"
-        if cit_details:
-            cit_details += "."
-        
-        # Final assembly
-        # Format: Author(s). Title. Journal. Year;Volume(Issue):Pages.
-        parts = [part for part in [authors_str, title, journal, year, cit_details] if part]
-        return " ".join(parts)
 
-class SpellCheckResponse(BaseModel):
+    # Final assembly
+    # Format: Author(s). Title. Journal. Year;Volume(Issue):Pages.
+    return " ".join([part for part in (authors_str, title, journal, year, cit_details) if part])
+
+class SpellCheckResponse(msgspec.Struct, frozen=True, kw_only=True):
     """Response from the spell check service."""
     original_query: str
     corrected_query: Optional[str] = None
     has_correction: bool
 
-class SemanticSearchResult(BaseModel):
+class SemanticSearchResult(msgspec.Struct, frozen=True):
     """Model for semantic search results, including a similarity score."""
-    score: Annotated[float, Field(ge=0, le=1)]  # Similarity score from 0 to 1
+    score: Annotated[float, msgspec.Meta(ge=0, le=1)]  # Similarity score from 0 to 1
     article: Article
 
-class CitationResponse(BaseModel):
+class CitationResponse(msgspec.Struct, frozen=True):
     """Model for a formatted citation with a link."""
     citation: str
-    link: HttpUrl
+    link: str